@@ -28,30 +28,62 @@ see: :class:`BasePlugin`.
 from __future__ import annotations
 
 import argparse
-import multiprocessing
 import sys
 import typing
 
-import orcha.properties
-
-from ..plugins import BasePlugin, ListPlugin, query_plugins
-from ..utils.logging_utils import get_logger
-from ..utils.packages import version
+from ..plugins import BasePlugin, ListPlugin, query_plugins_by_name
 
 if typing.TYPE_CHECKING:
-    from typing import Type
+    from typing import Callable, Type
+
+SERVER_COMMANDS = ("serve", "s", "srv")
+"""Command (and aliases) used for running a plugin as a service"""
+
+CLIENT_COMMANDS = ("run", "r")
+"""Command (and aliases) used for running a plugin as a client"""
+
+
+class LazyVersionAction(argparse.Action):
+    """``--version`` action that only builds the version string when the option is given.
+    It behaves as the ``"version"`` action but expects a function returning the version,
+    so no version lookup is done while building the parser.
+    """
+
+    def __init__(
+        self,
+        option_strings: list[str],
+        version: Callable[[], str],
+        dest: str = argparse.SUPPRESS,
+        default: str = argparse.SUPPRESS,
+        help: str = "show program's version number and exit",
+    ):
+        super().__init__(option_strings, dest=dest, default=default, nargs=0, help=help)
+        self.version = version
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        print(self.version())
+        parser.exit()
+
+
+def _orcha_version() -> str:
+    # pylint: disable=import-outside-toplevel
+    from ..utils.packages import version
 
-# application universal logger
-log = get_logger()
+    return f"orcha - {version('orcha')}"
 
 
-def create_parser(plugin: Type[BasePlugin], parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
-    p = parser.add_parser(plugin.name, help=plugin.help, aliases=plugin.aliases)
-    p.set_defaults(plugin=plugin)
-    p.add_argument("--version", action="version", version=plugin.version())
+def create_parser(plugin: Type[BasePlugin], prog: str) -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog=prog, description=plugin.help)
+    p.add_argument("--version", action=LazyVersionAction, version=plugin.version)
     return p
 
 
+def _plugin_parser(
+    plugin: Type[BasePlugin], command: str
+) -> Callable[[argparse.ArgumentParser], None] | None:
+    return plugin.client_parser if command in CLIENT_COMMANDS else plugin.server_parser
+
+
 def main():
     """Main application entry point. Multiple arguments are defined which allows
     further customization of the server/client process:
@@ -136,47 +168,54 @@ def main():
         default=None,
         help="Maximum concurrent tasks that can be run simultaneously",
     )
-    parser.add_argument("--version", action="version", version=f"orcha - {version('orcha')}")
-    subparsers = parser.add_subparsers(
-        title="available commands",
-        required=True,
-        metavar="command",
-    )
-    server_parser = subparsers.add_parser(
-        "serve",
-        help="Serves the given plugin acting as a service",
-        aliases=("s", "srv"),
-    )
-    server_parser.set_defaults(side="server")
-    client_parser = subparsers.add_parser(
-        "run",
-        help="Runs the given plugin acting as a client",
-        aliases=("r",),
+    parser.add_argument("--version", action=LazyVersionAction, version=_orcha_version)
+
+    plugin_by_name = query_plugins_by_name(cached=True)
+    plugin_by_name.update(dict.fromkeys((ListPlugin.name, *ListPlugin.aliases), ListPlugin))
+
+    # the command line is parsed in two stages: first, the global options alongside the
+    # command and the plugin name. Then, the remaining arguments are parsed by the requested
+    # plugin parser, which is the only one built
+    parser.add_argument(
+        "command",
+        choices=SERVER_COMMANDS + CLIENT_COMMANDS,
+        help="serve the plugin acting as a service or run it acting as a client",
     )
-    client_parser.set_defaults(side="client")
-    server_subparser = server_parser.add_subparsers(required=True)
-    client_subparser = client_parser.add_subparsers(required=True)
-
-    discovered_plugins = query_plugins()
-    discovered_plugins.append(ListPlugin)
-    for plugin in discovered_plugins:
-        if plugin.server_parser is not None:
-            plugin.server_parser(create_parser(plugin, server_subparser))
-        if plugin.client_parser is not None:
-            plugin.client_parser(create_parser(plugin, client_subparser))
-
-    args: argparse.Namespace = parser.parse_args()
+    parser.add_argument("plugin", choices=list(plugin_by_name), help="plugin to use")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="plugin arguments")
+    args = parser.parse_args()
+    command, name, rest = args.command, args.plugin, args.args
+    del args.command, args.args
+
+    requested = plugin_by_name[name]
+    plugin_parser = _plugin_parser(requested, command)
+    if plugin_parser is None:
+        parser.error(f"plugin '{name}' cannot be used with '{command}'")
+
+    p = create_parser(requested, f"{parser.prog} {command} {name}")
+    plugin_parser(p)
+    p.parse_args(rest, namespace=args)
+    args.plugin = requested
+    args.side = "client" if command in CLIENT_COMMANDS else "server"
+
+    # pylint: disable=import-outside-toplevel
+    import orcha.properties
+
     orcha.properties.listen_address = args.listen_address
     orcha.properties.port = args.port
     orcha.properties.max_workers = args.max_workers
     orcha.properties.look_ahead = args.look_ahead_items
     if args.key is not None:
+        # pylint: disable=import-outside-toplevel
+        import multiprocessing
+
+        from ..utils.logging_utils import get_logger
+
         orcha.properties.authkey = args.key.encode()
-        log.debug("fixing internal digest key")
+        get_logger().debug("fixing internal digest key")
         multiprocessing.current_process().authkey = args.key.encode()
 
-    for arg, value in vars(args).items():
-        orcha.properties.extras[arg] = value
+    orcha.properties.extras.update(vars(args))
 
     plugin: BasePlugin = args.plugin()
     return plugin.handle(args, is_client=args.side == "client")
@@ -30,15 +30,20 @@ if TYPE_CHECKING:
 
 class ConditionFailed(Exception):
     """The Orcha's condition was not met. The exception contains all the information that was
-    available when the condition was being evaluated."""
+    available when the condition was being evaluated.
+
+    The exception message is only built when the exception is converted to a string, as most
+    of the times it is caught and inspected by its attributes."""
 
     def __init__(self, condition: str, reason: str, environment: Optional[Dict[str, Any]] = None) -> None:
         self.condition = condition
         self.reason = reason
         self.environment = environment
+        super().__init__(condition, reason, environment)
 
-        msg = f'The condition "{condition}" was not met: {reason}'
-        if environment is not None:
-            msg += f" (environmental information={environment})"
+    def __str__(self) -> str:
+        msg = f'The condition "{self.condition}" was not met: {self.reason}'
+        if self.environment is not None:
+            msg += f" (environmental information={self.environment})"
 
-        super().__init__(msg)
+        return msg
@@ -37,4 +37,4 @@ class AttributeNotFoundException(Exception):
         super().__init__(f'class "{class_name}" has no attribute "{attribute}"')
 
 
-__all__ = ["InvalidPluggableException"]
+__all__ = ["InvalidPluggableException", "AttributeNotFoundException"]
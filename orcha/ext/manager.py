@@ -37,8 +37,8 @@ if typing.TYPE_CHECKING:
 
 
 class Manager(ABC):
-    def __init__(self):
-        self._look_ahead = look_ahead
+    # default value, shadowed per instance only when set
+    _look_ahead = look_ahead
 
     @property
     def look_ahead(self) -> int:
@@ -170,8 +170,9 @@ class Manager(ABC):
         default behavior of the orchestrator in a simple way.
 
         Important:
-            This method will be called multiple times: Everytime a hook is meant to be run, this
-            function will be executed. Therefore, its functionality should be kept minimal.
+            This method is called once, when the orchestrator starts. The returned plugs are
+            sorted and frozen, so any change done to the iterable afterwards is not taken into
+            account.
 
         If your application does not require (or request) any plugin, this method can simply
         return :obj:`None` or implement a stub like::
@@ -26,20 +26,19 @@ cannot be sent from clients to servers and vice versa.
 """
 from __future__ import annotations
 
-import errno
 import os
 import typing
 from abc import ABC, abstractmethod
-from contextlib import suppress
 from dataclasses import dataclass, field
 from enum import IntEnum, auto, unique
+from errno import EINVAL, EPERM
 from functools import total_ordering
 from queue import Queue
 
 from orcha.exceptions import InvalidStateError
 
 if typing.TYPE_CHECKING:
-    from typing import Any, Callable
+    from typing import Any, Callable, Iterable
 
     from typing_extensions import Self
 
@@ -104,17 +103,17 @@ class PetitionState(IntEnum):
     @property
     def is_stopped(self) -> bool:
         """Checks if the petition is stopped"""
-        return self in STOPPED_STATES
+        return ((1 << self) & STOPPED_MASK) != 0
 
     @property
     def is_in_running_state(self) -> bool:
         """Checks if the petition is in a running state"""
-        return self in RUNNING_STATES
+        return ((1 << self) & RUNNING_MASK) != 0
 
     @property
     def is_in_broken_state(self) -> bool:
         """Checks if the petition is in a broken state"""
-        return self in BROKEN_STATES
+        return ((1 << self) & BROKEN_MASK) != 0
 
     @property
     def is_done(self) -> bool:
@@ -122,52 +121,77 @@ class PetitionState(IntEnum):
         return self is self.DONE
 
 
-STOPPED_STATES = {
-    PetitionState.PENDING,
-    PetitionState.FINISHED,
-    PetitionState.BROKEN,
-}
+STOPPED_STATES = frozenset({PetitionState.PENDING, PetitionState.FINISHED, PetitionState.BROKEN})
 """Set of states in which :class:`petitions <orcha.interfaces.Petition>` are
 considered to be stopped, it is, not running or in a pre-running state.
 
 .. versionadded:: 0.2.5
+
+.. versionchanged:: 1.0.0
+    The set is now a :obj:`frozenset`.
 """
 
-RUNNING_STATES = {
-    PetitionState.RUNNING,
-    PetitionState.ENQUEUED,
-}
+RUNNING_STATES = frozenset({PetitionState.RUNNING, PetitionState.ENQUEUED})
 """Set of states in which :class:`petitions <orcha.interfaces.Petition>` are
 considered to be running, it is, already enqueued or running.
 
 .. versionadded:: 0.2.5
+
+.. versionchanged:: 1.0.0
+    The set is now a :obj:`frozenset`.
 """
 
-BROKEN_STATES = {
-    PetitionState.BROKEN,
-}
+BROKEN_STATES = frozenset({PetitionState.BROKEN})
 """Set of states in which :class:`petitions <orcha.interfaces.Petition>` are
 considered to be broken, it is, failed during execution, start, etc.
 
 .. versionadded:: 0.2.5
+
+.. versionchanged:: 1.0.0
+    The set is now a :obj:`frozenset`.
 """
 
-VALID_TRANSITIONS: dict[PetitionState, set[PetitionState]] = {
-    PetitionState.PENDING: {PetitionState.BROKEN, PetitionState.ENQUEUED},
-    PetitionState.ENQUEUED: {PetitionState.BROKEN, PetitionState.CANCELLED, PetitionState.RUNNING},
-    PetitionState.RUNNING: {PetitionState.BROKEN, PetitionState.CANCELLED, PetitionState.FINISHED},
-    PetitionState.FINISHED: {PetitionState.BROKEN, PetitionState.DONE},
-    PetitionState.CANCELLED: {PetitionState.BROKEN, PetitionState.DONE},
-    PetitionState.DONE: set(),
-    PetitionState.BROKEN: set(),
+VALID_TRANSITIONS: dict[PetitionState, frozenset[PetitionState]] = {
+    PetitionState.PENDING: frozenset({PetitionState.BROKEN, PetitionState.ENQUEUED}),
+    PetitionState.ENQUEUED: frozenset(
+        {PetitionState.BROKEN, PetitionState.CANCELLED, PetitionState.RUNNING}
+    ),
+    PetitionState.RUNNING: frozenset(
+        {PetitionState.BROKEN, PetitionState.CANCELLED, PetitionState.FINISHED}
+    ),
+    PetitionState.FINISHED: frozenset({PetitionState.BROKEN, PetitionState.DONE}),
+    PetitionState.CANCELLED: frozenset({PetitionState.BROKEN, PetitionState.DONE}),
+    PetitionState.DONE: frozenset(),
+    PetitionState.BROKEN: frozenset(),
 }
 """Set of states in which :class:`petitions <orcha.interfaces.Petition>` are
 expected to be, as well as the possible transitions to new states.
 
 .. versionadded:: 0.3.0
+
+.. versionchanged:: 1.0.0
+    The transitions are now :obj:`frozensets <frozenset>`.
 """
 
 
+def _mask(states: Iterable[PetitionState]) -> int:
+    mask = 0
+    for state in states:
+        mask |= 1 << state
+    return mask
+
+
+# bitmasks of the (frozen) sets above (bit "n" is set for the state whose value is "n"), so
+# checking whether a state belongs to any of them is a single shift and AND
+STOPPED_MASK = _mask(STOPPED_STATES)
+RUNNING_MASK = _mask(RUNNING_STATES)
+BROKEN_MASK = _mask(BROKEN_STATES)
+# indexed by the state value, so the lookup needs no hashing
+VALID_TRANSITIONS_MASK: tuple[int, ...] = tuple(
+    _mask(VALID_TRANSITIONS.get(value, ())) for value in range(max(PetitionState) + 1)
+)
+
+
 @total_ordering
 @dataclass
 class Petition(ABC):
@@ -279,10 +303,14 @@ class Petition(ABC):
 
         .. versionchanged:: 0.3.0:: This field is now a property
         """
-        if state is not self.__state__ and state not in VALID_TRANSITIONS[self.__state__]:
+        current = self.__state__
+        if state is current:
+            return
+
+        if not (1 << state) & VALID_TRANSITIONS_MASK[current]:
             raise InvalidStateError(
-                f'Cannot go to state "{state.name}" from current state "{self.__state__.name}" '
-                f'"[{self.__state__.name} --X-> {state.name}]'
+                f'Cannot go to state "{state.name}" from current state "{current.name}" '
+                f'"[{current.name} --X-> {state.name}]'
             )
 
         self.__state__ = state
@@ -312,8 +340,11 @@ class Petition(ABC):
         if self.queue is None:
             raise AttributeError(f"Queue is not initialized for petition {type(self).__name__}")
 
-        with suppress(ValueError):
+        # a closed queue raises ValueError, which is ignored
+        try:
             self.queue.put(message, block=blocking)
+        except ValueError:
+            pass
 
     def communicate_nw(self, message: Any):
         """
@@ -330,8 +361,11 @@ class Petition(ABC):
         if self.queue is None:
             raise AttributeError(f"Queue is not initialized for petition {type(self).__name__}")
 
-        with suppress(ValueError):
+        # a closed queue raises ValueError, which is ignored
+        try:
             self.queue.put_nowait(message)
+        except ValueError:
+            pass
 
     @abstractmethod
     def action(self):
@@ -367,8 +401,11 @@ class Petition(ABC):
         if self.queue is None:
             raise AttributeError(f"Queue is not initialized for petition {type(self).__name__}")
 
-        with suppress(ValueError):
+        # a closed queue raises ValueError, which is ignored
+        try:
             self.queue.put(ret)
+        except ValueError:
+            pass
 
     @abstractmethod
     def terminate(self) -> bool:
@@ -400,21 +437,26 @@ class Petition(ABC):
         sid = self.id
         oid = __o.id
 
-        # if IDs are not strings, convert them so we can truly compare
-        if not isinstance(sid, str):
-            sid = str(sid)
+        # IDs of the same kind are compared directly. Otherwise, convert them to strings
+        # so we can truly compare
+        if type(sid) is type(oid):
+            return sid == oid
 
-        if not isinstance(oid, str):
-            oid = str(oid)
+        return str(sid) == str(oid)
 
-        return sid == oid
+    def __hash__(self) -> int:
+        # consistent with __eq__, which considers equal IDs with the same string form
+        return hash(str(self.id))
 
     def __lt__(self, __o: object) -> bool:
-        if not isinstance(__o, Petition):
-            raise NotImplementedError()
-
-        # we check equality for the priorities
-        return self.priority < __o.priority
+        # petitions are compared on every queue operation, so the type is only checked when
+        # the comparison cannot be done
+        try:
+            return self.priority < __o.priority
+        except AttributeError:
+            if not isinstance(__o, Petition):
+                raise NotImplementedError() from None
+            raise
 
 
 @dataclass
@@ -478,18 +520,16 @@ class SignalingPetition(Petition):
         if self.pid is None or self.pid <= 0:
             raise ValueError(f'Petition of type "{type(self).__name__}" requires a valid PID')
 
-        kill_fn = os.killpg if self.is_process_group else os.kill
         try:
-            kill_fn(self.pid, self.signal)
+            # "killpg" is only looked up when needed, as it is not available on every platform
+            (os.killpg if self.is_process_group else os.kill)(self.pid, self.signal)
         except OSError as err:
-            if err.errno == errno.EINVAL:
+            if err.errno == EINVAL:
                 raise ValueError(f'Unknown signal "{self.signal}" for petition "{self}"') from err
-            if err.errno == errno.EPERM:
-                return False
             # according to "man 2 kill", errno can be one of EINVAL, EPERM or ESRCH (which means
             # that the PID or PGID does not exist, which is OK because it can refer an already
-            # dead process).
-            return True
+            # dead process). So only EPERM is an actual failure
+            return err.errno != EPERM
         else:
             return True
 
@@ -26,15 +26,16 @@ from __future__ import annotations
 import inspect
 import logging
 import typing
+from functools import lru_cache
 
 from typing import final
 
 from orcha.exceptions import AttributeNotFoundException, ConditionFailed
-from orcha.interfaces import notimplemented
+from orcha.interfaces import is_implemented, notimplemented
 from orcha.utils import Nameable, get_class_logger
 
 if typing.TYPE_CHECKING:
-    from typing import Callable, Optional, TypeVar, Union, NoReturn
+    from typing import Any, Callable, Optional, TypeVar, Union, NoReturn
 
     from orcha.interfaces import Result
     from orcha.ext import Petition
@@ -43,10 +44,18 @@ if typing.TYPE_CHECKING:
     T = TypeVar("T")
 
 
+@lru_cache(maxsize=None)
+def _signature(func: Callable[..., Any]) -> inspect.Signature:
+    return inspect.signature(func)
+
+
 class Pluggable(Nameable):
     def __init__(self, priority: float):
         self.__priority = priority
         self.log = get_class_logger(self)
+        # the log level is taken from the environment when the logger is created
+        self._debug = self.log.isEnabledFor(logging.DEBUG)
+        self._has_attr_cache: dict[str, bool] = {}
 
     def __lt__(self, other: Pluggable) -> bool:
         return self.__priority < other.__priority  # pylint: disable=protected-access
@@ -55,10 +64,38 @@ class Pluggable(Nameable):
     def run_hook(
         self, func: Callable[..., T], *args, do_raise: bool = False, **kwargs
     ) -> Optional[T]:
+        # not implemented hooks do nothing, so there is no need to go any further
+        if not is_implemented(func):
+            return None
+
+        fname = func.__name__
+        try:
+            has_attr = self._has_attr_cache.get(fname)
+            if has_attr is None:
+                has_attr = self._has_attr_cache[fname] = hasattr(self, fname)
+
+            if not has_attr:
+                raise AttributeNotFoundException(self.classname(), fname)
+        except AttributeNotFoundException as not_found:
+            self.log.debug(
+                '[%s] API: plug has no attribute "%s", skipping...',
+                not_found.class_name,
+                not_found.attribute,
+            )
+            return None
+
+        return self._call_hook(func, *args, do_raise=do_raise, **kwargs)
+
+    @final
+    def _call_hook(
+        self, func: Callable[..., T], *args, do_raise: bool = False, **kwargs
+    ) -> Optional[T]:
+        # same as "run_hook" but without its checks, for hooks already known to be implemented
+        # by this plug (see "Orcha._implementers")
         fname = func.__name__
         try:
-            if self.log.level == logging.DEBUG:
-                sig = inspect.signature(func)
+            if self._debug:
+                sig = _signature(func)
                 bound_args = sig.bind(*args, **kwargs)
                 self.log.debug(
                     "[%s] API: %s(%s)",
@@ -67,16 +104,7 @@ class Pluggable(Nameable):
                     ", ".join((f"{k}={v})" for k, v in bound_args.arguments.items())),
                 )
 
-            if not hasattr(self, fname):
-                raise AttributeNotFoundException(self.classname(), fname)
-
             return func(*args, **kwargs)
-        except AttributeNotFoundException as not_found:
-            self.log.debug(
-                '[%s] API: plug has no attribute "%s", skipping...',
-                not_found.class_name,
-                not_found.attribute,
-            )
         except Exception as e:
             self.log.fatal(
                 '[%s] API: unhandled exception while running API function "%s" - %s',
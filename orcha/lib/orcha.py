@@ -22,9 +22,11 @@
 """Manager module containing the :class:`Orcha`"""
 from __future__ import annotations
 
+import ctypes
 import errno
 import multiprocessing
 import typing
+import weakref
 from collections.abc import Iterable
 from multiprocessing.managers import SyncManager
 from warnings import warn
@@ -34,7 +36,7 @@ from typing import final
 from orcha import properties
 from orcha.exceptions import ManagerShutdownError, InvalidPluggableException, ConditionFailed
 from orcha.ext.manager import Manager
-from orcha.ext.petition import Petition, PetitionState
+from orcha.ext.petition import BROKEN_STATES, Petition, PetitionState
 from orcha.ext.pluggable import Pluggable
 from orcha.interfaces import is_implemented
 from orcha.lib.client import Client
@@ -44,6 +46,7 @@ from orcha.utils import autoproxy
 from orcha.utils.logging_utils import get_logger
 
 if typing.TYPE_CHECKING:
+    from multiprocessing.synchronize import Event
     from threading import Thread
     from typing import Any, Callable, Type, Optional, NoReturn, Union
 
@@ -52,6 +55,24 @@ if typing.TYPE_CHECKING:
 # system logger
 log = get_logger()
 
+# hooks fired by the orchestrator, indexed once the plugs are frozen
+_PLUG_HOOKS = (
+    "on_manager_start",
+    "on_manager_shutdown",
+    "on_message_preconvert",
+    "on_petition_create",
+    "on_condition_failed",
+    "on_petition_start",
+    "on_petition_finish",
+    "on_condition_check",
+)
+
+# hooks for which only the first plug is asked
+_FIRST_PLUG_HOOKS = frozenset({"on_condition_check"})
+
+# states a finished petition keeps, instead of being marked as finished
+_KEEP_ON_FINISH = frozenset({PetitionState.CANCELLED, *BROKEN_STATES})
+
 # possible Processor pending queue - placed here due to inheritance reasons
 # in multiprocessing
 _queue = multiprocessing.Queue()
@@ -61,6 +82,11 @@ _queue = multiprocessing.Queue()
 _finish_queue = multiprocessing.Queue()
 
 
+def _warn_if_not_shutdown(shutdown: Event):
+    if not shutdown.is_set():
+        warn('"shutdown()" not called! There can be leftovers pending to remove')
+
+
 class Orcha:
     """:class:`Orcha` is the object an application must inherit from in order to work with
     Orcha. A :class:`Orcha` encapsulates all the logic behind the application, making
@@ -176,6 +202,8 @@ class Orcha:
             one is (i.e.: if you define priorities based on time, allow the second item to be
             executed before the first one). Take special care with this parameter as this may
             cause starvation in processes.
+        max_workers (:obj:`int`, optional): maximum amount of petitions the :class:`Processor`
+            runs concurrently. Defaults to :attr:`max_workers <orcha.properties.max_workers>`.
 
     .. versionchanged:: 0.3.0
         There is no more ``notify_watchdog`` parameter as everything has been moved into the
@@ -183,6 +211,9 @@ class Orcha:
         because the module has been refactored into multiple submodules, so it is easier to
         developers to focus on their code. This implies that :class:`Orcha` now requires a
         :class:`Manager <orcha.ext.Manager>` to work.
+
+    .. versionchanged:: 1.0.0
+        New ``max_workers`` parameter, forwarded to the :class:`Processor`.
     """
 
     def __init__(
@@ -196,6 +227,7 @@ class Orcha:
         finish_queue: multiprocessing.Queue | None,
         is_client: bool,
         look_ahead: int,
+        max_workers: int | None = None,
     ):
         self.manager = manager_cls()
 
@@ -204,20 +236,30 @@ class Orcha:
         self._is_client = is_client
         self._set_lock = multiprocessing.Lock()
         self._petition_lock = multiprocessing.Lock()
-        self._lock = multiprocessing.Lock()
-        self._enqueued_messages = set()
+        # readers use the current snapshot with no lock, writers publish a new one under it
+        self._enqueued_messages: frozenset[int | str] = frozenset()
         self._shutdown = multiprocessing.Event()
+        # mirrors "_shutdown" so the message paths can check it without taking any lock
+        self._shutdown_flag = multiprocessing.Value(ctypes.c_bool, False, lock=False)
         self._plugs: tuple[Pluggable, ...] = tuple()
+        self._hooks: dict[str, tuple[tuple[Callable[..., Any], Callable[..., Any]], ...]] = {}
         self._plug_threads: list[Thread] = []
         self._started = False
         self.look_ahead = look_ahead
 
+        # servers warn when collected (or at exit) without having been shut down. Unlike
+        # "__del__", this does not keep the instance alive, nor runs on a half-built one
+        if not is_client:
+            weakref.finalize(self, _warn_if_not_shutdown, self._shutdown)
+
         # clients don't need any processor
         if create_processor and not is_client:
             log.debug("creating processor for %s", self)
             queue = queue or _queue
             finish_queue = finish_queue or _finish_queue
-            self._processor = Processor(queue, finish_queue, self, look_ahead)
+            self._processor = Processor(
+                queue, finish_queue, self, look_ahead, max_workers=max_workers
+            )
 
         log.debug("manager created - running setup...")
         try:
@@ -242,6 +284,7 @@ class Orcha:
             finish_queue=_finish_queue,
             is_client=False,
             look_ahead=properties.look_ahead,
+            max_workers=properties.max_workers,
         )
 
     @classmethod
@@ -265,18 +308,16 @@ class Orcha:
         Returns:
             :obj:`int`: look ahead attribute.
         """
-        with self._lock:
-            if hasattr(self.manager, "look_ahead"):
-                return self.manager.look_ahead
-            return self._look_ahead
+        if hasattr(self.manager, "look_ahead"):
+            return self.manager.look_ahead
+        return self._look_ahead
 
     @look_ahead.setter
     def look_ahead(self, value: int):
-        with self._lock:
-            if hasattr(self.manager, "look_ahead"):
-                self.manager.look_ahead = value
-            else:
-                self._look_ahead = value
+        if hasattr(self.manager, "look_ahead"):
+            self.manager.look_ahead = value
+        else:
+            self._look_ahead = value
 
     @property
     def is_client(self) -> bool:
@@ -329,6 +370,11 @@ class Orcha:
                     raise InvalidPluggableException(f'Object "{plug}" is not a {Pluggable.classname()}')
 
             self._plugs = tuple(sorted(tmp_plugs))
+            self._hooks.clear()
+            # the hooks fired by the orchestrator are indexed upfront, so no thread has to
+            # update the table while handling petitions
+            for name in _PLUG_HOOKS:
+                self._implementers(name)
 
     @final
     def start(self):
@@ -340,7 +386,8 @@ class Orcha:
         """
         if not self.is_client:
             # fix autoproxy class in Python versions < 3.9.*
-            autoproxy.fix()
+            if autoproxy.NEEDS_FIX:
+                autoproxy.fix()
 
             # pylint: disable=consider-using-with
             log.debug("starting manager")
@@ -384,6 +431,7 @@ class Orcha:
             return errno.EEXIST
 
         self._shutdown.set()
+        self._shutdown_flag.value = True
         try:
             self.on_manager_shutdown()
             if self._create_processor and not self.is_client:
@@ -458,10 +506,16 @@ class Orcha:
         log.debug('registering callable "%s" with name "%s"', func, name)
         self._mp_manager.register(name, func, **kwargs)  # pylint: disable=no-member
 
-        def temp(*args, **kwds):
-            return getattr(self._mp_manager, name)(*args, **kwds)
+        # the manager exposes the registered call as a method, so it is bound directly.
+        # Only when no method is created (i.e.: "create_method=False") it is looked up per call
+        try:
+            setattr(self, name, getattr(self._mp_manager, name))
+        except AttributeError:
+
+            def temp(*args, **kwds):
+                return getattr(self._mp_manager, name)(*args, **kwds)
 
-        setattr(self, name, temp)
+            setattr(self, name, temp)
 
     @final
     def send(self, message: MessageWrapper):
@@ -480,6 +534,24 @@ class Orcha:
                                   has been tried to enqueue.
         """
 
+    @final
+    def send_batch(self, messages: list[MessageWrapper]):
+        """Sends multiple :class:`Messages <orcha.interface.Message>` to the server manager at
+        once. This method is a stub until :func:`setup` is called (as that function overrides it).
+
+        It behaves as calling :func:`send` for every message, in order, but the messages
+        travel to the server (and to the processor) together, saving a round trip per message.
+
+        .. versionadded:: 1.0.0
+
+        Args:
+            messages (list[Message]): the messages to enqueue
+
+        Raises:
+            ManagerShutdownError: if the manager has been shutdown and new messages
+                                  have been tried to enqueue.
+        """
+
     @final
     def finish(self, message: MessageWrapper | int | str):
         """Requests the ending of a running :class:`message <orcha.interfaces.Message>`.
@@ -503,15 +575,23 @@ class Orcha:
 
     @final
     def _add_message(self, m: MessageWrapper):
-        if not self._shutdown.is_set():
+        if not self._shutdown_flag.value:
             return self._processor.enqueue(m)
 
         log.debug("we're off - enqueue petition not accepted for message with ID %s", m.id)
         raise ManagerShutdownError("manager has been shutdown - no more petitions are accepted")
 
+    @final
+    def _add_messages(self, ms: list[MessageWrapper]):
+        if not self._shutdown_flag.value:
+            return self._processor.enqueue_many(ms)
+
+        log.debug("we're off - enqueue petitions not accepted for %d message(s)", len(ms))
+        raise ManagerShutdownError("manager has been shutdown - no more petitions are accepted")
+
     @final
     def _finish_message(self, m: MessageWrapper | int | str):
-        if not self._shutdown.is_set():
+        if not self._shutdown_flag.value:
             return self._processor.finish(m)
 
         log.debug(
@@ -523,9 +603,10 @@ class Orcha:
     @final
     def setup(self):
         """
-        Setups the internal state of the manager, registering two functions:
+        Setups the internal state of the manager, registering three functions:
 
             + :func:`send`
+            + :func:`send_batch`
             + :func:`finish`
 
         If running as a server, defines the functions bodies and sets the internal state of the
@@ -533,9 +614,11 @@ class Orcha:
         and leverages the execution to the remote manager.
         """
         send_fn = None if self.is_client else self._add_message
+        send_batch_fn = None if self.is_client else self._add_messages
         finish_fn = None if self.is_client else self._finish_message
 
         self.register("send", send_fn)
+        self.register("send_batch", send_batch_fn)
         self.register("finish", finish_fn)
 
     def is_running(self, x: MessageWrapper | Petition | int | str) -> bool:
@@ -563,8 +646,7 @@ class Orcha:
             if isinstance(x, (MessageWrapper, Petition)):
                 x = x.id
 
-            with self._set_lock:
-                return x in self._enqueued_messages
+            return x in self._enqueued_messages
 
         raise NotImplementedError()
 
@@ -579,21 +661,21 @@ class Orcha:
             int: amount of running processes
         """
         if not self.is_client:
-            with self._set_lock:
-                return len(self._enqueued_messages)
+            return len(self._enqueued_messages)
 
         raise NotImplementedError()
 
     @final
     def check(self, petition: Petition) -> Optional[NoReturn]:
-        with self._petition_lock:
-            if self.is_client:
-                raise ConditionFailed("not is a client", f"orcha instance {self} is a client")
+        if self._is_client:
+            raise ConditionFailed("not is a client", f"orcha instance {self} is a client")
 
-            if not petition.state.is_enqueued:
+        with self._petition_lock:
+            if petition.state is not PetitionState.ENQUEUED:
                 raise ConditionFailed("petition enqueued", f"petition {petition} is not enqueued")
 
-            if self.is_running(petition):
+            # same as "is_running", without the client and type checks already done
+            if petition.id in self._enqueued_messages:
                 raise ConditionFailed("petition running", f"petition {petition} already running")
 
             result = self.on_condition_check(petition)
@@ -639,17 +721,17 @@ class Orcha:
             raise NotImplementedError()
 
         with self._set_lock:
-            self._enqueued_messages.add(petition.id)
+            self._enqueued_messages = self._enqueued_messages | {petition.id}
 
         with self._petition_lock:
             self.on_petition_start(petition)
             # if some plugin starts the petition, skip the `on_start` call
-            if petition.state.is_enqueued:
+            if petition.state is PetitionState.ENQUEUED:
                 petition.state = PetitionState.RUNNING
                 return self.manager.on_start(petition)
 
             # petition is already running by any of the plugins
-            return petition.state.is_running
+            return petition.state is PetitionState.RUNNING
 
     @final
     def finish_petition(self, petition: Petition):
@@ -673,28 +755,51 @@ class Orcha:
         if self.is_client:
             raise NotImplementedError()
 
-        if self.is_running(petition):
-            with self._set_lock:
-                self._enqueued_messages.remove(petition.id)
+        # membership is checked and dropped at once, so the petition is only finished once
+        with self._set_lock:
+            was_running = petition.id in self._enqueued_messages
+            if was_running:
+                self._enqueued_messages = self._enqueued_messages - {petition.id}
 
+        if was_running:
             with self._petition_lock:
-                if not (petition.state.has_been_cancelled or petition.state.is_in_broken_state):
+                if petition.state not in _KEEP_ON_FINISH:
                     petition.state = PetitionState.FINISHED
 
                 self.on_petition_finish(petition)
                 # if some plugin finishes the petition, skip the `on_finish` call
-                if not petition.state.is_done:
+                if petition.state is not PetitionState.DONE:
                     self.manager.on_finish(petition)
 
+    @final
+    def _implementers(
+        self, name: str
+    ) -> tuple[tuple[Callable[..., Any], Callable[..., Any]], ...]:
+        # plugs are frozen once started, so the implemented hooks are resolved just once.
+        # Hooks are looked up on the class, so missing ones cost no exception nor bound method.
+        # Both the plug hook runner and the hook itself are kept bound, ready to be called. As
+        # only implemented hooks are kept, the checks done by "run_hook" are skipped
+        hooks = self._hooks.get(name)
+        if hooks is None:
+            resolved = []
+            plugs = self._plugs[:1] if name in _FIRST_PLUG_HOOKS else self._plugs
+            for plug in plugs:
+                hook = getattr(type(plug), name, None)
+                if hook is not None and is_implemented(hook):
+                    # pylint: disable=protected-access
+                    resolved.append((plug._call_hook, getattr(plug, name)))
+
+            hooks = self._hooks[name] = tuple(resolved)
+
+        return hooks
+
     @final
     def run_hooks(self, name: str, *args, **kwargs):
-        for plug in self._plugs:
-            if not hasattr(plug, name):
-                continue
+        if not self._plugs:
+            return
 
-            fn = getattr(plug, name)
-            if is_implemented(fn):
-                plug.run_hook(fn, *args, **kwargs)
+        for run_hook, fn in self._implementers(name):
+            run_hook(fn, *args, **kwargs)
 
     @final
     def on_manager_start(self):
@@ -706,17 +811,17 @@ class Orcha:
 
     @final
     def on_message_preconvert(self, message: MessageWrapper) -> Petition | None:
-        for plug in self._plugs:
-            if is_implemented(plug.on_message_preconvert):
-                ret = plug.run_hook(plug.on_message_preconvert, message)
-                if ret is not None:
-                    return ret
+        for run_hook, hook in self._implementers("on_message_preconvert"):
+            ret = run_hook(hook, message)
+            if ret is not None:
+                return ret
 
         return self.manager.convert_to_petition(message)
 
     @final
     def on_petition_create(self, petition: Petition):
-        self.run_hooks("on_petition_create", petition)
+        for run_hook, hook in self._implementers("on_petition_create"):
+            run_hook(hook, petition)
 
     @final
     def on_condition_check(self, petition: Petition) -> Union[Optional[ConditionFailed], NoReturn]:
@@ -724,15 +829,13 @@ class Orcha:
         if isinstance(res, ConditionFailed):
             return res
 
-        plugs = iter(self._plugs)
-        try:
-            plug = next(plugs)
-            if is_implemented(plug.on_condition_check):
-                res = plug.run_hook(plug.on_condition_check, petition, do_raise=True)
-                if isinstance(res, ConditionFailed):
-                    return res
-        except StopIteration:
-            pass
+        # only the first plug is asked, if any
+        for run_hook, hook in self._implementers("on_condition_check"):
+            res = run_hook(hook, petition, do_raise=True)
+            if isinstance(res, ConditionFailed):
+                return res
+
+        return None
 
     @final
     def on_condition_failed(self, condition: ConditionFailed) -> None:
@@ -741,25 +844,20 @@ class Orcha:
 
     @final
     def on_petition_start(self, petition: Petition):
-        for plug in self._plugs:
-            if is_implemented(plug.on_petition_start):
-                plug.run_hook(plug.on_petition_start, petition)
-
-            if petition.state.is_running:
+        # the state may change on any hook, so only the expected member is hoisted
+        running = PetitionState.RUNNING
+        for run_hook, hook in self._implementers("on_petition_start"):
+            run_hook(hook, petition)
+            if petition.state is running:
                 break
 
     @final
     def on_petition_finish(self, petition: Petition):
-        for plug in self._plugs:
-            if is_implemented(plug.on_petition_finish):
-                plug.run_hook(plug.on_petition_finish, petition)
-
-            if petition.state.is_done:
+        done = PetitionState.DONE
+        for run_hook, hook in self._implementers("on_petition_finish"):
+            run_hook(hook, petition)
+            if petition.state is done:
                 break
 
-    def __del__(self):
-        if not self.is_client and not self._shutdown.is_set():
-            warn('"shutdown()" not called! There can be leftovers pending to remove')
-
 
 __all__ = ("Orcha",)
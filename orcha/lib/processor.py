@@ -31,25 +31,58 @@ import random
 import typing
 from collections import deque, defaultdict
 from concurrent.futures import Future, ThreadPoolExecutor
-from contextlib import suppress
-from queue import Empty, PriorityQueue, Queue
-from threading import Lock, Thread
+from functools import partial
+from heapq import heappop, heappush
+from sys import intern
+from threading import Condition, Event, Lock, Thread
 
 from typing import final
 
 from orcha import properties
 from orcha.exceptions import ConditionFailed
 from orcha.ext.petition import Petition, PetitionState
-from orcha.lib.petition import EMPTY_PETITION_ID, EmptyPetition, Placeholder
+from orcha.lib.petition import EMPTY_PETITION_ID, EmptyPetition
 from orcha.lib.wrapper import MessageWrapper
 from orcha.utils import get_logger, nop
 
 if typing.TYPE_CHECKING:
+    from typing import Callable, Iterable
+
     from orcha.lib import Orcha
 
 log = get_logger()
 
 
+class _PetitionQueue:
+    # priority queue of petitions whose batch operations take the lock just once, instead of
+    # once per petition as a "queue.PriorityQueue" would do
+    __slots__ = ("_heap", "_not_empty")
+
+    def __init__(self):
+        self._heap: list[Petition] = []
+        self._not_empty = Condition(Lock())
+
+    def put(self, petition: Petition):
+        with self._not_empty:
+            heappush(self._heap, petition)
+            self._not_empty.notify()
+
+    def put_many(self, petitions: Iterable[Petition]):
+        with self._not_empty:
+            for petition in petitions:
+                heappush(self._heap, petition)
+            self._not_empty.notify()
+
+    def get_many(self, n: int, into: list[Petition]):
+        # blocks until there is at least one petition, then takes up to "n" of them
+        with self._not_empty:
+            heap = self._heap
+            while not heap:
+                self._not_empty.wait()
+            for _ in range(min(n, len(heap))):
+                into.append(heappop(heap))
+
+
 @final
 class Processor:
     """
@@ -78,17 +111,15 @@ class Processor:
          |                      ┌─────────────────────────┐             ║ o         ║
          |              ╔═══════  Internal petition queue  ◄═══════╦════╝ n         ║
          |              ║       └─────────────────────────┘        ║                ║
-         |              ║           ┌─────────────────────────┐    ║                ║
-         |              ║        ╔══   Internal signal queue   ◄═══║════════════════╝
-         |              ║        ║  └─────────────────────────┘    ║
-         |              ║        ║                                 ║      not
-         |              ▼        ╚══════╗                          ║ p.condition(p)
-         | ╔══════════════════════════╗ ║       ╔══════════════════╩═════╗
-         ├►║ Internal petition thread ╠═║══════►║ Petition launch thread ║
-         | ╚══════════════════════════╝ ▼       ╚══════════════════╤═════╝
-         |       ╔════════════════════════╗                 ▲      |  ┌───────────────────────────┐
-         └──────►║ Internal signal thread ╠═════════════════╝      ├─►| manager.start_petition(p) |
-                 ╚════════════════════════╝   send SIGTERM         |  └───────────────────────────┘
+         |              ║                                          ║                ║
+         |              ║                                          ║      not       ║
+         |              ▼                                          ║ p.condition(p) ║
+         | ╔══════════════════════════╗         ╔══════════════════╩═════╗          ║
+         └►║ Internal petition thread ╠════════►║ Petition launch thread ║◄═════════╝
+           ╚══════════════════════════╝         ╚══════════════════╤═════╝   send SIGTERM
+                                                                   |  ┌───────────────────────────┐
+                                                                   ├─►| manager.start_petition(p) |
+                                                                   |  └───────────────────────────┘
                                                                    |   ┌─────────────────┐
                                                                    ├──►| p.action(fn, p) |
                                                                    |   └─────────────────┘
@@ -107,7 +138,7 @@ class Processor:
 
     1. **Queues**
 
-    The point of having four :py:class:`queues <queue.Queue>` is that messages are traveling
+    The point of having three :py:class:`queues <queue.Queue>` is that messages are traveling
     across threads in a safe way. When a message is received from another process, there is
     some "black magic" going underneath the
     :py:class:`BaseManager <multiprocessing.managers.BaseManager>` class involving pipes, queues
@@ -128,11 +159,12 @@ class Processor:
     or deletions won't be propagated to the rest of the processes as it is a local-only
     object.
 
-    For that reason, there is four queues: two of them have the mission of receiving
-    the requests from other processes and once the request is received by us and is
+    For that reason, there is three queues: two of them have the mission of receiving
+    the requests from other processes and once a message is received by us and is
     available on our process, it is then added to an internal priority queue by the
-    handler threads (allowing, for example, sorting of the petitions based on their
-    priority, which wouldn't be possible on a proxied queue).
+    handler thread (allowing, for example, sorting of the petitions based on their
+    priority, which wouldn't be possible on a proxied queue). Finish signals need no
+    sorting, so they are handled directly by the thread reading them.
 
     2. **Threads**
 
@@ -146,11 +178,11 @@ class Processor:
     will pause the entire main thread until all queues are unlocked sequentially, one after
     each other, preventing any other request to arrive and being processed.
 
-    That's the reason why there are two threads just listening to proxied queues and placing
-    the requests on another queue. In addition, the execution of the action is also run
-    asynchronously in order to not to block the main thread during the processing (this
-    also applies to the evaluation of the :attr:`condition <orcha.interfaces.Petition.condition>`
-    predicate).
+    That's the reason why there are two threads just listening to proxied queues: one placing
+    the requests on another queue and the other one dispatching the finish signals. In
+    addition, the execution of the action is also run asynchronously in order to not to block
+    the main thread during the processing (this also applies to the evaluation of the
+    :attr:`condition <orcha.interfaces.Petition.condition>` predicate).
 
     Each time a new thread is spawned for a :class:`Petition`, it is saved on a list of
     currently running threads. There is another thread running from the start of the
@@ -203,6 +235,11 @@ class Processor:
             one is (i.e.: if you define priorities based on time, allow the second item to be
             executed before the first one). Take special care with this parameter as this may
             cause starvation in processes.
+        max_workers (:obj:`int`, optional): maximum amount of petitions run concurrently. Defaults
+            to :attr:`max_workers <orcha.properties.max_workers>`.
+
+    .. versionchanged:: 1.0.0
+        New ``max_workers`` parameter.
 
     Raises:
         ValueError: when no arguments are given and the processor has not been initialized yet.
@@ -223,6 +260,7 @@ class Processor:
         finishq: multiprocessing.Queue[MessageWrapper | None] | None = None,
         orcha: Orcha | None = None,
         look_ahead: int = 1,
+        max_workers: int | None = None,
     ):
         if self.__must_init__:
             if queue is None:
@@ -234,6 +272,7 @@ class Processor:
 
             self._lock = Lock()
             self._queue: multiprocessing.Queue[MessageWrapper | None] = queue
+            self._backlog: deque[MessageWrapper] = deque()
             self._finishq: multiprocessing.Queue[MessageWrapper | None] = finishq
             self.orcha = orcha
             self.look_ahead = look_ahead
@@ -241,20 +280,28 @@ class Processor:
             self._finished = multiprocessing.Event()
             self.running = True
 
-            self._executor = ThreadPoolExecutor(max_workers=properties.max_workers)
-            self._internalq: Queue[Petition] = PriorityQueue()
-            self._signals: Queue[MessageWrapper | int | str | None] = Queue()
-            self._threads: list[Thread] = []
+            if max_workers is None:
+                max_workers = properties.max_workers
+
+            log.debug("running petitions with max. workers: %s", max_workers or "default")
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="orcha-petition"
+            )
+            self._internalq = _PetitionQueue()
             self._petitions: dict[int | str, Petition] = {}
-            self._seen_petitions: dict[int | str, int] = defaultdict(lambda: 0)
+            self._seen_petitions: dict[int | str, int] = defaultdict(int)
             self._starving: set[int | str] = set()
-            self._process_t = Thread(target=self._process)
-            self._internal_t = Thread(target=self._internal_process)
-            self._finished_t = Thread(target=self._signal_handler)
-            self._signal_t = Thread(target=self._internal_signal_handler)
+            # reused on every iteration of the internal processor
+            self._grabbed: list[Petition] = []
+            self._unsuccessful: list[Petition] = []
+            self._was_starving = False
+            # set whenever a retry may succeed now: a new petition arrived or another finished
+            self._wakeup = Event()
+            self._process_t = self._create_thread("message processor", self._process)
+            self._internal_t = self._create_thread("petition processor", self._internal_process)
+            self._signal_t = self._create_thread("signal handler", self._signal_handler)
             self._process_t.start()
             self._internal_t.start()
-            self._finished_t.start()
             self._signal_t.start()
             self.__must_init__ = False
 
@@ -327,6 +374,18 @@ class Processor:
         """
         self._queue.put(m)
 
+    def enqueue_many(self, ms: list[MessageWrapper]):
+        """Enqueues all the given messages at once, so they go through the queue in a single
+        operation instead of one per message.
+
+        .. versionadded:: 1.0.0
+
+        Args:
+            ms (list[MessageWrapper]): the messages to enqueue, in order
+        """
+        if ms:
+            self._queue.put(list(ms))
+
     def finish(self, m: MessageWrapper | int | str):
         """Sets a finish signal for the given message.
 
@@ -343,6 +402,22 @@ class Processor:
         log.debug("received petition for finish message with ID %s", m)
         self._finishq.put(m)
 
+    def _create_thread(self, role: str, target: Callable[[], None]) -> Thread:
+        # daemon threads, so an interpreter exiting without a "shutdown" is not kept alive by
+        # threads blocked on their queues
+        return Thread(
+            target=self._run_guarded,
+            args=(f"{role} thread", target),
+            name=f"orcha-{role.replace(' ', '-')}",
+            daemon=True,
+        )
+
+    def _run_guarded(self, function: str, target: Callable[[], None]):
+        try:
+            target()
+        except Exception as e:
+            self._fatal_error(function, e)
+
     def _fatal_error(self, function: str, exception: BaseException):
         log.fatal("unhandled exception at %s: %s", function, exception, exc_info=exception)
         log.fatal("finishing orchestrator...")
@@ -350,20 +425,32 @@ class Processor:
         self.orcha.shutdown(errno.EINVAL)
 
     def _pop_message(self) -> MessageWrapper | None:
-        with suppress(Empty):
-            m = self._queue.get(timeout=properties.queue_timeout)
-            if m is None:
-                return None
+        # messages enqueued together are kept aside and handled one by one
+        if self._backlog:
+            m = self._backlog.popleft()
+        else:
+            # blocks until a message arrives - "shutdown" wakes the thread up with a "None"
+            m = self._queue.get()
+
+        if isinstance(m, list):
+            self._backlog.extend(m)
+            m = self._backlog.popleft()
+
+        if m is None:
+            return None
+
+        # IDs are the keys of every petition lookup, so string ones are interned and
+        # further lookups of the same ID (i.e.: finish requests) compare by identity
+        if isinstance(m.id, str):
+            m.id = intern(m.id)
 
-            if self.is_running(m):
-                log.warning("received message (%s) already running", m)
-                return None
+        if self.is_running(m):
+            log.warning("received message (%s) already running", m)
+            return None
 
-            return m
-        return None
+        return m
 
     def _process_message(self, message: MessageWrapper) -> Petition | None:
-        self._petitions[message.id] = Placeholder(message.id)
         log.debug('converting message "%s" into a petition', message)
         # make sure petition "p" always exists
         p: Petition | None = None
@@ -376,28 +463,25 @@ class Processor:
                 message, e,
             )
             log.debug(e, exc_info=e)
-            self._petitions.pop(message.id)
             return None
 
         if p is None:
             log.debug('message "%s" is invalid, skipping...', message)
-            self._petitions.pop(message.id)
             return None
 
         log.debug("> %s", p)
         return p
 
     def _prepare_petition(self, petition: Petition):
-        if not isinstance(petition, EmptyPetition):
-            self.orcha.on_petition_create(petition)
-            # recover state from placeholder petition
-            petition.state = self._petitions[petition.id].state
+        self.orcha.on_petition_create(petition)
 
-        # when done (or on EmptyPetition), try to enqueue it or finish, depending on the state
+        # the petition is only registered once created, keeping any state set by the plugs.
+        # When done, try to enqueue it or finish, depending on the state
         self._petitions[petition.id] = petition
         if not petition.state.is_in_broken_state:
             petition.state = PetitionState.ENQUEUED
             self._internalq.put(petition)
+            self._wakeup.set()
         else:
             self._do_signal(petition.id)
 
@@ -408,43 +492,44 @@ class Processor:
         else:
             log.debug("skipping internal digest key fixing as authkey is not defined")
 
-        try:
-            while self.running:
-                log.debug("waiting for message...")
-                message = self._pop_message()
-                petition = EmptyPetition() if message is None else self._process_message(message)
+        while self.running:
+            log.debug("waiting for message...")
+            message = self._pop_message()
+            # nothing to enqueue - the internal thread is woken up by "_wakeup" when needed, and
+            # "shutdown" wakes it up by itself
+            if message is None:
+                continue
 
-                # invalid petition
-                if petition is None:
-                    continue
+            petition = self._process_message(message)
 
-                self._prepare_petition(petition)
-        except Exception as e:
-            self._fatal_error("message processor thread", e)
+            # invalid petition
+            if petition is None:
+                continue
 
-    def _on_petition_done_callback(self, p: Petition):
-        def callback(future: Future):
-            if not future.done():
-                raise AttributeError(
-                    "this function is expected to be a callback to a finished future!"
-                )
+            self._prepare_petition(petition)
 
-            ex = future.exception()
-            if ex is not None:
-                log.warning(
-                    'unhandled exception while running petition "%s" -> "%s"',
-                    p,
-                    ex,
-                    exc_info=ex,
-                )
-                p.state = PetitionState.BROKEN
+    def _on_petition_done(self, p: Petition, future: Future):
+        # bound to each petition with "partial", so no closure is created per petition
+        if not future.done():
+            raise AttributeError(
+                "this function is expected to be a callback to a finished future!"
+            )
 
-            log.debug('petition "%s" finished, triggering callbacks', p)
-            self._petitions.pop(p.id, None)
+        ex = future.exception()
+        if ex is not None:
+            log.warning(
+                'unhandled exception while running petition "%s" -> "%s"',
+                p,
+                ex,
+                exc_info=ex,
+            )
+            p.state = PetitionState.BROKEN
 
-            self.orcha.finish_petition(p)
+        log.debug('petition "%s" finished, triggering callbacks', p)
+        self._petitions.pop(p.id, None)
 
-        return callback
+        self.orcha.finish_petition(p)
+        self._wakeup.set()
 
     def _do_start(self, p: Petition):
         # Petition's condition is checked before this call
@@ -457,24 +542,18 @@ class Processor:
             healthy = False
 
         f = self._executor.submit(p.action) if healthy else self._executor.submit(nop)
-        f.add_done_callback(self._on_petition_done_callback(p))
+        f.add_done_callback(partial(self._on_petition_done, p))
         self._seen_petitions.pop(p.id, None)
-        if p.id in self._starving:
-            self._starving.discard(p.id)
-        if len(self._starving) == 0:
+        self._starving.discard(p.id)
+        if self._was_starving and not self._starving:
+            self._was_starving = False
             self.look_ahead = self._old_look_ahead
 
-    def _pop_petition(self) -> Petition | None:
-        with suppress(Empty):
-            return self._internalq.get(timeout=properties.queue_timeout)
-        return None
-
     def _handle_petitions(
-        self, petitions: deque[Petition], unsuccessful_petitions: list[Petition]
+        self, petitions: list[Petition], unsuccessful_petitions: list[Petition]
     ) -> int | str:
         last_id = -1
-        while len(petitions) > 0:
-            petition = petitions.popleft()
+        for petition in petitions:
             last_id = petition.id
             if isinstance(petition, EmptyPetition):
                 break
@@ -495,55 +574,92 @@ class Processor:
             if ready:
                 self._do_start(petition)
             # ignore all possible broken/cancelled petitions
-            elif petition.state.is_enqueued:
+            elif petition.state is PetitionState.ENQUEUED:
                 unsuccessful_petitions.append(petition)
 
         return last_id
 
-    def _grab_petitions(self) -> deque[Petition]:
-        petitions: deque[Petition] = deque()
-        for i in range(1, self.look_ahead + 1):
-            p = self._pop_petition()
-            if p is not None:
-                petitions.append(p)
+    def _grab_petitions(self, look_ahead: int, petitions: list[Petition]):
+        # wait for the first petition only, then take as many of the available ones as allowed.
+        # Blocks until a petition is available - "shutdown" enqueues an empty one
+        self._internalq.get_many(max(look_ahead, 1), petitions)
 
-            if i > self._internalq.qsize():
-                break
+    def _expire_seen_petitions(self):
+        # petitions cancelled while waiting in the queue never reach "_do_start", so their
+        # counters are dropped once they are no longer registered
+        for id in self._seen_petitions.keys() - self._petitions.keys():
+            del self._seen_petitions[id]
+            self._starving.discard(id)
 
-        return petitions
+        if self._was_starving and not self._starving:
+            self._was_starving = False
+            self.look_ahead = self._old_look_ahead
 
     def _internal_process(self):
-        try:
-            last_seen_petition = None
-            while self.running:
-                log.debug("waiting for next %d internal petition(s)...", self.look_ahead)
-                unsuccessful_petitions: list[Petition] = []
-                petitions = self._grab_petitions()
-                last_petition_id = self._handle_petitions(petitions, unsuccessful_petitions)
-                empty = last_petition_id == EMPTY_PETITION_ID
-
-                for petition in unsuccessful_petitions:
-                    log.debug(
-                        'petition "%s" did not satisfy the condition, re-adding to queue', petition
-                    )
-                    self._seen_petitions[petition.id] += 1
-                    if self._seen_petitions[petition.id] >= 1000:  # petition is starving
-                        self._starving.add(petition.id)
-                    self._internalq.put(petition)
-
-                # if there are starving petitions, change the look ahead to handle one petition at a time
-                if len(self._starving) > 0:
-                    self._old_look_ahead = self.look_ahead
-                    self.look_ahead = 1
-
-                if not empty and last_seen_petition == last_petition_id:
-                    self.wait(random.uniform(0.5, 5))
-
-                last_seen_petition = last_petition_id
-            log.debug("internal process handler finished")
+        last_seen_petition = None
+        iterations = 0
+        while self.running:
+            iterations += 1
+            if iterations % 1000 == 0:
+                self._expire_seen_petitions()
+            # read once per iteration, as it goes through the manager and may change anytime
+            look_ahead = self.look_ahead
+            log.debug("waiting for next %d internal petition(s)...", look_ahead)
+            petitions = self._grabbed
+            unsuccessful_petitions = self._unsuccessful
+            self._grab_petitions(look_ahead, petitions)
+            last_petition_id = self._handle_petitions(petitions, unsuccessful_petitions)
+            empty = last_petition_id == EMPTY_PETITION_ID
+
+            for petition in unsuccessful_petitions:
+                log.debug(
+                    'petition "%s" did not satisfy the condition, re-adding to queue', petition
+                )
+                seen = self._seen_petitions[petition.id] + 1
+                self._seen_petitions[petition.id] = seen
+                if seen >= 1000:  # petition is starving
+                    self._starving.add(petition.id)
+
+            if unsuccessful_petitions:
+                self._internalq.put_many(unsuccessful_petitions)
+
+            # emptied here, so no petition is kept alive while waiting for the next ones
+            petitions.clear()
+            unsuccessful_petitions.clear()
+
+            # if there are starving petitions, change the look ahead to handle one petition
+            # at a time. It is only changed (and restored) when the starvation begins (ends)
+            if self._starving and not self._was_starving:
+                self._was_starving = True
+                self._old_look_ahead = self.look_ahead
+                self.look_ahead = 1
+
+            if not empty and last_seen_petition == last_petition_id:
+                # nothing could be run - wait until something changes (or retry anyway
+                # after a while, as conditions may depend on external resources)
+                self._wakeup.wait(random.uniform(0.5, 5))
+                self._wakeup.clear()
+
+            last_seen_petition = last_petition_id
+        log.debug("internal process handler finished")
+
+    def _do_signal(self, id: int | str) -> bool:
+        # a single "pop" both checks and claims the petition, so it is finished just once even
+        # if it is done (or signaled) concurrently
+        petition = self._petitions.pop(id, None)
+        if petition is None:
+            return False
 
-        except Exception as e:
-            self._fatal_error("petition processor thread", e)
+        self._executor.submit(self._finish, petition)
+        return True
+
+    def _pop_signal(self) -> int | str | None:
+        # blocks until a signal arrives - "shutdown" wakes the thread up with a "None"
+        m = self._finishq.get()
+        if isinstance(m, MessageWrapper):
+            m = m.id
+
+        return intern(m) if isinstance(m, str) else m
 
     def _signal_handler(self):
         if properties.authkey is not None:
@@ -552,57 +668,29 @@ class Processor:
         else:
             log.debug("skipping internal digest key fixing as authkey is not defined")
 
-        try:
-            while self.running:
-                log.debug("waiting for finish message...")
-                with suppress(Empty):
-                    m = self._finishq.get(timeout=properties.queue_timeout)
-                    self._signals.put(m)
-        except Exception as e:
-            self._fatal_error("signal processor thread", e)
-
-    def _do_signal(self, id: int | str):
-        petition = self._petitions.pop(id)
-        self._executor.submit(self._finish, petition)
-
-    def _pop_signal(self) -> int | str | None:
-        with suppress(Empty):
-            m = self._signals.get(timeout=properties.queue_timeout)
-            if isinstance(m, MessageWrapper):
-                m = m.id
+        while self.running:
+            log.debug("waiting for finish message...")
+            signal_id = self._pop_signal()
+            if signal_id is None:
+                continue
 
-            return m
-        return None
-
-    def _internal_signal_handler(self):
-        try:
-            while self.running:
-                log.debug("waiting for internal signal...")
-                signal_id = self._pop_signal()
-                if signal_id is None:
-                    continue
-
-                log.debug('received signal petition for message with ID "%s"', signal_id)
-                if signal_id not in self._petitions:
-                    log.debug('message with ID "%s" not found or not running!', signal_id)
-                    continue
-
-                self._do_signal(signal_id)
-        except Exception as e:
-            self._fatal_error("signal handler thread", e)
+            log.debug('received signal petition for message with ID "%s"', signal_id)
+            if not self._do_signal(signal_id):
+                log.debug('message with ID "%s" not found or not running!', signal_id)
 
     def _finish(self, p: Petition):
         try:
-            if p.state.is_stopped:
+            state = p.state
+            if state.is_stopped:
                 raise ValueError(
                     "Cannot terminate a petition whose state is either FINISHED, PENDING or BROKEN"
                 )
 
+            if not state.is_in_running_state:
+                raise AttributeError(f"Unknown petition state: {state}")
+
             # if we are called, our state is now CANCELLED
-            if p.state.is_in_running_state:
-                p.state = PetitionState.CANCELLED
-            else:
-                raise AttributeError(f"Unknown petition state: {p.state}")
+            p.state = PetitionState.CANCELLED
 
             if not p.terminate():
                 raise RuntimeError(f'Failed to finish petition instance "{type(p).__name__}"')
@@ -626,8 +714,12 @@ class Processor:
         try:
             log.info("finishing processor")
             self.running = False
+            # threads block on their queues, so each one is woken up to notice the shutdown
             self._queue.put(None)
             self._finishq.put(None)
+            # a new one, so its state is not shared with any other petition
+            self._internalq.put(EmptyPetition())
+            self._wakeup.set()
 
             # self._queue.close()
             # self._finishq.close()
@@ -637,20 +729,15 @@ class Processor:
             self._internal_t.join(timeout=5)
 
             log.info("waiting for pending signals...")
-            self._finished_t.join(timeout=5)
             self._signal_t.join(timeout=5)
 
             log.info("finishing all registered petitions...")
-            # we need to "cast" the dictionary to a set so we can alter its size while iterating
-            for id in set(self._petitions):
+            # the keys are copied so the dictionary can change its size while iterating
+            for id in list(self._petitions):
                 self._do_signal(id)
 
             log.info("waiting for pending operations...")
-            for thread in self._threads:
-                thread.join(timeout=30)
-
-            log.info("closing all running threads...")
-            self._executor.shutdown()
+            self._executor.shutdown(wait=True)
 
             log.info("finished")
         except Exception as e:
@@ -26,10 +26,8 @@ Alongside with :class:`Manager <orcha.lib.Manager>`, it's the heart of the orche
 from __future__ import annotations
 
 import typing
-from binascii import hexlify
-from random import randbytes
-
 from dataclasses import dataclass, field
+from secrets import token_hex
 
 if typing.TYPE_CHECKING:
     from queue import Queue
@@ -46,14 +44,13 @@ def _getattribute(obj, item):
 class MessageWrapper:
     message: Message
     queue: Queue
-    id: str = field(default_factory=hexlify(randbytes(4)).decode, init=False)
+    id: str = field(default_factory=lambda: token_hex(4), init=False)
 
     def __getattr__(self, item: str):
-        msg = _getattribute(self, "message")
-        if hasattr(msg, item):
-            attr = _getattribute(msg, item)
-            if attr is not None:
-                return attr
+        # a single lookup on the message - "hasattr" would already fetch the attribute once
+        attr = getattr(_getattribute(self, "message"), item, None)
+        if attr is not None:
+            return attr
         return _getattribute(self, item)
 
     def __getitem__(self, item: Any) -> Any:
@@ -35,6 +35,6 @@ Note:
 """
 from .base import BasePlugin
 from .lp import ListPlugin
-from .utils import query_plugins
+from .utils import query_plugins, query_plugins_by_name
 
-__all__ = ["BasePlugin", "ListPlugin", "query_plugins"]
+__all__ = ["BasePlugin", "ListPlugin", "query_plugins", "query_plugins_by_name"]
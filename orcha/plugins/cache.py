@@ -0,0 +1,345 @@
+#                                   MIT License
+#
+#              Copyright (c) 2023 Javier Alonso <jalonso@teldat.com>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#      copies of the Software, and to permit persons to whom the Software is
+#            furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+#                 copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#     AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#                                    SOFTWARE.
+"""On-disk cache of the installed plugins, so they are not imported on every invocation"""
+from __future__ import annotations
+
+import hashlib
+import importlib
+import json
+import os
+import sys
+import typing
+from contextlib import suppress
+from importlib.util import find_spec
+
+from ..utils import get_logger
+
+if typing.TYPE_CHECKING:
+    from argparse import ArgumentParser
+    from typing import Any, Callable, Iterable, Type, TypeVar
+
+    from .base import BasePlugin
+
+    T = TypeVar("T")
+
+if sys.version_info < (3, 10):
+    from importlib_metadata import EntryPoint, entry_points
+else:
+    from importlib.metadata import EntryPoint, entry_points
+
+log = get_logger()
+
+CACHE_FILE = os.environ.get(
+    "ORCHA_PLUGINS_CACHE",
+    os.path.join(
+        os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+        "orcha",
+        "plugins.json",
+    ),
+)
+"""Location of the plugins cache, by default ``~/.cache/orcha/plugins.json``. The value can
+be controlled through ``ORCHA_PLUGINS_CACHE`` environment variable. Setting it to an empty
+string disables the cache.
+"""
+
+
+class CachedPlugin:
+    """Lightweight stand-in of a :class:`BasePlugin <orcha.plugins.BasePlugin>` class whose
+    metadata (name, aliases, help and version) is known without importing the plugin module.
+    The module is imported only when the plugin is actually used: either when any of its
+    parsers is requested or when the plugin is instantiated.
+
+    Args:
+        module (:obj:`str`): module that exports the plugin.
+        attr (:obj:`str`): name of the plugin class within the :attr:`module`.
+        name (:obj:`str`): name of the plugin command.
+        help (:obj:`str`, optional): help string of the plugin command.
+        aliases (:obj:`tuple`): aliases of the plugin command.
+        version (:obj:`str`): version string of the plugin.
+        server (:obj:`bool`): whether the plugin defines a server parser.
+        client (:obj:`bool`): whether the plugin defines a client parser.
+        cls (:obj:`Type[BasePlugin]`, optional): the plugin class, if already loaded.
+    """
+
+    def __init__(
+        self,
+        module: str,
+        attr: str,
+        name: str,
+        help: str | None,
+        aliases: tuple,
+        version: str,
+        server: bool,
+        client: bool,
+        cls: Type[BasePlugin] | None = None,
+    ):
+        self.module = module
+        self.attr = attr
+        self.name = name
+        self.help = help
+        self.aliases = tuple(aliases)
+        self._version = version
+        self._server = server
+        self._client = client
+        self._cls = cls
+
+    @classmethod
+    def from_class(cls, module: str, attr: str, plugin: Type[BasePlugin]) -> CachedPlugin:
+        return cls(
+            module=module,
+            attr=attr,
+            name=plugin.name,
+            help=plugin.help,
+            aliases=plugin.aliases,
+            version=plugin.version(),
+            server=plugin.server_parser is not None,
+            client=plugin.client_parser is not None,
+            cls=plugin,
+        )
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> CachedPlugin:
+        return cls(**d)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "module": self.module,
+            "attr": self.attr,
+            "name": self.name,
+            "help": self.help,
+            "aliases": self.aliases,
+            "version": self._version,
+            "server": self._server,
+            "client": self._client,
+        }
+
+    def load(self) -> Type[BasePlugin]:
+        """Imports the plugin module (if not done yet) and returns the plugin class.
+
+        Raises:
+            :obj:`TypeError`: if the exported object is not a
+                :class:`BasePlugin <orcha.plugins.BasePlugin>` subclass.
+        """
+        if self._cls is None:
+            # pylint: disable=import-outside-toplevel
+            from .base import BasePlugin
+
+            plugin = importlib.import_module(self.module)
+            for attr in self.attr.split("."):
+                plugin = getattr(plugin, attr)
+
+            if not (isinstance(plugin, type) and issubclass(plugin, BasePlugin)):
+                raise TypeError(f'"{self.module}:{self.attr}" is not a "BasePlugin" subclass')
+
+            self._cls = plugin
+        return self._cls
+
+    @property
+    def server_parser(self) -> Callable[[ArgumentParser], None] | None:
+        return self.load().server_parser if self._server else None
+
+    @property
+    def client_parser(self) -> Callable[[ArgumentParser], None] | None:
+        return self.load().client_parser if self._client else None
+
+    def version(self) -> str:
+        return self._version
+
+    def __call__(self, *args, **kwargs) -> BasePlugin:
+        return self.load()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"<cached plugin '{self.module}:{self.attr}'>"
+
+
+def _mtime(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _sources_mtime(module: str) -> int | None:
+    # locates the top-level package of the module without importing it, and takes the latest
+    # modification of any of its sources - nested ones included
+    try:
+        spec = find_spec(module.partition(".")[0])
+    except (ImportError, ValueError):
+        return None
+
+    if spec is None or spec.origin is None:
+        return None
+
+    if not spec.submodule_search_locations:
+        return _mtime(spec.origin)
+
+    latest = None
+    for location in spec.submodule_search_locations:
+        for root, dirs, files in os.walk(location):
+            dirs[:] = [d for d in dirs if d != "__pycache__"]
+            for file in files:
+                if file.endswith(".py"):
+                    mtime = _mtime(os.path.join(root, file))
+                    if mtime is not None and (latest is None or mtime > latest):
+                        latest = mtime
+
+    return latest
+
+
+def fingerprint(eps: Iterable[EntryPoint] | None = None) -> str:
+    """Builds a fingerprint of the installed plugins, which changes whenever a plugin is
+    installed, upgraded, reinstalled or removed, or any source of the package its entry point
+    refers to is modified (i.e.: on editable installs).
+
+    Only the ``orcha-framework`` entry points are inspected, so the cost does not depend on
+    the amount of installed distributions.
+
+    Args:
+        eps (:obj:`Iterable` [:obj:`EntryPoint`], optional): the ``orcha-framework`` entry
+            points, if already queried. Defaults to :obj:`None`, which queries them.
+
+    Returns:
+        :obj:`str`: the installed plugins fingerprint.
+    """
+    if eps is None:
+        eps = entry_points(group="orcha-framework")
+
+    plugins = []
+    for ep in eps:
+        # the installed files record changes with every (re)install. The metadata itself is
+        # not parsed, as it is way slower
+        dist = getattr(ep, "dist", None)
+        record = dist.read_text("RECORD") if dist is not None else None
+        plugins.append((ep.name, ep.value, record, _sources_mtime(ep.module)))
+
+    return hashlib.sha256(repr(sorted(plugins, key=repr)).encode()).hexdigest()
+
+
+def dispatch(plugins: list[T]) -> dict[str, T]:
+    """Builds the dispatch table of the given plugins, so they can be looked up by their name
+    or any of their aliases.
+
+    Args:
+        plugins (:obj:`list`): the plugins to index.
+
+    Returns:
+        :obj:`dict`: the plugins indexed by their names and aliases.
+    """
+    return {alias: plugin for plugin in plugins for alias in (plugin.name, *plugin.aliases)}
+
+
+def _read(key: str) -> dict[str, Any] | None:
+    if not CACHE_FILE:
+        return None
+
+    try:
+        with open(CACHE_FILE, "r", encoding="utf-8") as cache:
+            return json.load(cache).get(key)
+    except (OSError, ValueError, AttributeError) as e:
+        log.debug('unable to read plugins cache "%s": %s', CACHE_FILE, e)
+        return None
+
+
+def load(key: str) -> list[CachedPlugin] | None:
+    """Loads the cached plugins, if any.
+
+    Args:
+        key (:obj:`str`): expected :func:`fingerprint` of the cached entries.
+
+    Returns:
+        :obj:`list` [:obj:`CachedPlugin`] | :obj:`None`: the cached plugins, or :obj:`None` if
+            there is no cache or it is outdated.
+    """
+    entry = _read(key)
+    if entry is None:
+        return None
+
+    try:
+        return [CachedPlugin.from_dict(plugin) for plugin in entry["plugins"]]
+    except (KeyError, TypeError) as e:
+        log.debug('invalid plugins cache "%s": %s', CACHE_FILE, e)
+        return None
+
+
+def load_dispatch(key: str) -> dict[str, CachedPlugin] | None:
+    """Loads the cached :func:`dispatch` table, if any. The table is stored alongside the
+    plugins, so it is not rebuilt on every invocation.
+
+    Args:
+        key (:obj:`str`): expected :func:`fingerprint` of the cached entries.
+
+    Returns:
+        :obj:`dict` [:obj:`str`, :obj:`CachedPlugin`] | :obj:`None`: the cached plugins indexed
+            by their names and aliases, or :obj:`None` if there is no cache or it is outdated.
+    """
+    entry = _read(key)
+    if entry is None:
+        return None
+
+    try:
+        plugins = [CachedPlugin.from_dict(plugin) for plugin in entry["plugins"]]
+        return {alias: plugins[i] for alias, i in entry["dispatch"].items()}
+    except (KeyError, IndexError, TypeError, AttributeError) as e:
+        log.debug('invalid plugins cache "%s": %s', CACHE_FILE, e)
+        return None
+
+
+def store(key: str, plugins: list[CachedPlugin]):
+    """Stores the given plugins and their :func:`dispatch` table in the cache, replacing any
+    previous content.
+
+    Args:
+        key (:obj:`str`): :func:`fingerprint` of the installed plugins.
+        plugins (:obj:`list` [:obj:`CachedPlugin`]): the plugins to store.
+    """
+    if not CACHE_FILE:
+        return
+
+    entry = {
+        "plugins": [plugin.as_dict() for plugin in plugins],
+        "dispatch": {
+            alias: i
+            for i, plugin in enumerate(plugins)
+            for alias in (plugin.name, *plugin.aliases)
+        },
+    }
+    tmp = f"{CACHE_FILE}.{os.getpid()}"
+    try:
+        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as cache:
+            json.dump({key: entry}, cache)
+        os.replace(tmp, CACHE_FILE)
+    except (OSError, TypeError, ValueError) as e:
+        log.debug('unable to write plugins cache "%s": %s', CACHE_FILE, e)
+        with suppress(OSError):
+            os.remove(tmp)
+
+
+__all__ = [
+    "CachedPlugin",
+    "CACHE_FILE",
+    "dispatch",
+    "fingerprint",
+    "load",
+    "load_dispatch",
+    "store",
+]
@@ -58,7 +58,7 @@ class ListPlugin(BasePlugin):
         raise NotImplementedError()
 
     def client_main(self, namespace: Namespace, orcha: Orcha) -> int:
-        discovered_plugins = query_plugins()
+        discovered_plugins = query_plugins(cached=True)
         discovered_plugins.append(type(self))
         plugins = [plugin.version() for plugin in discovered_plugins]
         plugins = sorted(plugins)
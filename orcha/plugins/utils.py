@@ -26,29 +26,23 @@ import sys
 import typing
 
 from ..utils import get_logger
+from . import cache
 from .base import BasePlugin
 
 if typing.TYPE_CHECKING:
-    from typing import Type
+    from typing import Iterable, Type
 
 if sys.version_info < (3, 10):
-    from importlib_metadata import entry_points
+    from importlib_metadata import EntryPoint, entry_points
 else:
-    from importlib.metadata import entry_points
+    from importlib.metadata import EntryPoint, entry_points
 log = get_logger()
 
 
-def query_plugins() -> list[Type[BasePlugin]]:
-    """
-    Query all installed plugins on the system. Notice that plugins must start with the
-    prefix ``orcha_`` and must export an object with name ``plugin`` which holds a reference
-    to a class inheriting from :class:`BasePlugin`.
-
-    Returns:
-        list[BasePlugin]: a dictionary whose keys are module names and the value is
-                               the module itself.
-    """
-    plugins_eps = entry_points(group="orcha-framework")
+def _load_plugins(
+    plugins_eps: Iterable[EntryPoint], key: str | None = None
+) -> list[Type[BasePlugin]]:
+    # when a cache key is given, the plugins are wrapped and stored in the cache under it
     plugins: list[Type[BasePlugin]] = []
     for plugin in plugins_eps:
         pl: Type[BasePlugin] = plugin.load()
@@ -59,6 +53,66 @@ def query_plugins() -> list[Type[BasePlugin]]:
                 plugin,
             )
             continue
+
+        if key is not None:
+            pl = cache.CachedPlugin.from_class(plugin.module, plugin.attr, pl)
         plugins.append(pl)
 
+    if key is not None:
+        cache.store(key, plugins)
+
     return plugins
+
+
+def query_plugins(cached: bool = False) -> list[Type[BasePlugin]]:
+    """
+    Query all installed plugins on the system. Notice that plugins must start with the
+    prefix ``orcha_`` and must export an object with name ``plugin`` which holds a reference
+    to a class inheriting from :class:`BasePlugin`.
+
+    Args:
+        cached (:obj:`bool`): whether to use the on-disk plugins cache. When set, the plugins
+            are returned as :class:`CachedPlugin <orcha.plugins.cache.CachedPlugin>` objects
+            and their modules are not imported until they are used. The cache is refreshed
+            whenever the installed plugins change. Defaults to :obj:`False`.
+
+    Returns:
+        list[BasePlugin]: a dictionary whose keys are module names and the value is
+                               the module itself.
+    """
+    plugins_eps = entry_points(group="orcha-framework")
+    if not cached:
+        return _load_plugins(plugins_eps)
+
+    key = cache.fingerprint(plugins_eps)
+    cached_plugins = cache.load(key)
+    if cached_plugins is not None:
+        return cached_plugins
+
+    return _load_plugins(plugins_eps, key)
+
+
+def query_plugins_by_name(cached: bool = False) -> dict[str, Type[BasePlugin]]:
+    """
+    Same as :func:`query_plugins` but the plugins are indexed by their names and aliases. When
+    using the on-disk plugins cache, the index is stored alongside the plugins so it is not
+    rebuilt on every call.
+
+    Args:
+        cached (:obj:`bool`): whether to use the on-disk plugins cache. See
+            :func:`query_plugins`. Defaults to :obj:`False`.
+
+    Returns:
+        dict[str, BasePlugin]: the installed plugins indexed by their names and aliases.
+    """
+    plugins_eps = entry_points(group="orcha-framework")
+    if not cached:
+        return cache.dispatch(_load_plugins(plugins_eps))
+
+    # the fingerprint is computed once, and reused for storing the plugins on a cache miss
+    key = cache.fingerprint(plugins_eps)
+    cached_plugins = cache.load_dispatch(key)
+    if cached_plugins is not None:
+        return cached_plugins
+
+    return cache.dispatch(_load_plugins(plugins_eps, key))
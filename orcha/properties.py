@@ -105,6 +105,10 @@ happen that threads take more time to finish.
 Value can be controlled through ``QUEUE_TIMEOUT`` environment variable.
 
 .. versionadded:: 0.3.0
+
+.. versionchanged:: 1.0.0
+    The :class:`Processor <orcha.lib.Processor>` no longer polls its queues, it blocks until
+    an item arrives and is woken up on shutdown. This value is kept for compatibility.
 """
 
 max_workers: Optional[int] = None
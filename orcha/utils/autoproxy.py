@@ -19,6 +19,13 @@ from .logging_utils import get_logger
 log = get_logger()
 _AutoProxy = getattr(managers, "AutoProxy")
 
+NEEDS_FIX = "manager_owned" not in signature(_AutoProxy).parameters
+"""Whether :func:`fix` has still something to patch in the running interpreter - it is,
+Python versions < 3.9 which have not been patched yet.
+
+.. versionadded:: 1.0.0
+"""
+
 
 @wraps(_AutoProxy)
 def AutoProxy(*args, incref=True, manager_owned=False, **kwargs):
@@ -33,6 +40,7 @@ def AutoProxy(*args, incref=True, manager_owned=False, **kwargs):
 
 
 def fix():
+    global NEEDS_FIX  # pylint: disable=global-statement
     if "manager_owned" in signature(_AutoProxy).parameters:
         log.debug(
             "Python interpreter (%d.%d.%d) has AutoProxy already patched",
@@ -55,3 +63,5 @@ def fix():
 
         # pylint: disable=no-member
         SyncManager.register(typeid, callable, proxytype, exposed, method_to_typeid, create_method)
+
+    NEEDS_FIX = False
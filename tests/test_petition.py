@@ -0,0 +1,50 @@
+"""Checks for petitions: internal ones round-trip and base class defaults stay reachable"""
+from __future__ import annotations
+
+import copy
+import pickle
+import unittest
+
+from orcha.ext.petition import PetitionState, SignalingPetition
+from orcha.lib.petition import EMPTY_PETITION_ID, EmptyPetition, Placeholder
+
+
+class CustomInitPetition(SignalingPetition):
+    """Third-party petition whose constructor skips the generated one"""
+
+    # pylint: disable=super-init-not-called
+    def __init__(self, id: int):
+        self.id = id
+
+    def action(self):
+        ...
+
+    def condition(self):
+        return True
+
+
+class TestInternalPetitions(unittest.TestCase):
+    def test_empty_petition_round_trip(self):
+        p = EmptyPetition()
+        for clone in (pickle.loads(pickle.dumps(p)), copy.copy(p), copy.deepcopy(p)):
+            self.assertEqual(clone.id, EMPTY_PETITION_ID)
+            self.assertEqual(clone.priority, float("inf"))
+            self.assertIs(clone.state, p.state)
+
+    def test_placeholder_round_trip(self):
+        p = Placeholder("x")
+        for clone in (pickle.loads(pickle.dumps(p)), copy.copy(p), copy.deepcopy(p)):
+            self.assertEqual(clone.id, "x")
+            self.assertEqual(clone.priority, float("inf"))
+            self.assertIs(clone.state, p.state)
+
+
+class TestPetitionDefaults(unittest.TestCase):
+    def test_defaults_without_generated_init(self):
+        p = CustomInitPetition(1)
+        self.assertIs(p.state, PetitionState.PENDING)
+        self.assertIsNone(p.pid)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+"""Checks for the on-disk plugins cache key"""
+from __future__ import annotations
+
+import importlib
+import os
+import sys
+import tempfile
+import unittest
+
+from orcha.plugins import cache
+
+if sys.version_info < (3, 10):
+    from importlib_metadata import EntryPoint
+else:
+    from importlib.metadata import EntryPoint
+
+
+class TestFingerprint(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.nested = os.path.join(tmp.name, "orcha_nested", "server", "parser.py")
+        os.makedirs(os.path.dirname(self.nested))
+        for path in (
+            os.path.join(tmp.name, "orcha_nested", "__init__.py"),
+            os.path.join(tmp.name, "orcha_nested", "server", "__init__.py"),
+            self.nested,
+        ):
+            with open(path, "w", encoding="utf-8"):
+                pass
+
+        sys.path.insert(0, tmp.name)
+        self.addCleanup(sys.path.remove, tmp.name)
+        importlib.invalidate_caches()
+        self.eps = [EntryPoint("nested", "orcha_nested:plugin", "orcha-framework")]
+
+    def test_nested_module_change(self):
+        before = cache.fingerprint(self.eps)
+        self.assertEqual(before, cache.fingerprint(self.eps))
+
+        stat = os.stat(self.nested)
+        os.utime(self.nested, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertNotEqual(before, cache.fingerprint(self.eps))
+
+    def test_plugin_is_not_imported(self):
+        cache.fingerprint(self.eps)
+        self.assertNotIn("orcha_nested", sys.modules)
+
+
+if __name__ == "__main__":
+    unittest.main()